@@ -26,15 +26,15 @@ from nova import utils
 CHUNKS = 4
 CHUNK_LENGTH = 255
 MAX_SIZE = CHUNKS * CHUNK_LENGTH
+_PASSWORD_KEYS = tuple('password_%d' % i for i in range(CHUNKS))
+_PASSWORD_SLICES = tuple((i * CHUNK_LENGTH, (i + 1) * CHUNK_LENGTH)
+                         for i in range(CHUNKS))
 
 
 def extract_password(instance):
-    result = ''
     sys_meta = utils.instance_sys_meta(instance)
-    for key in sorted(sys_meta.keys()):
-        if key.startswith('password_'):
-            result += sys_meta[key]
-    return result or None
+    parts = [sys_meta[key] for key in _PASSWORD_KEYS if key in sys_meta]
+    return ''.join(parts) or None
 
 
 def convert_password(context, password):
@@ -46,15 +46,11 @@ def convert_password(context, password):
     if six.PY3 and isinstance(password, bytes):
         password = password.decode('utf-8')
 
-    meta = {}
-    for i in range(CHUNKS):
-        meta['password_%d' % i] = password[:CHUNK_LENGTH]
-        password = password[CHUNK_LENGTH:]
-    return meta
+    return {key: password[start:stop]
+            for key, (start, stop) in zip(_PASSWORD_KEYS, _PASSWORD_SLICES)}
 
 
 def handle_password(req, meta_data):
-    ctxt = context.get_admin_context()
     if req.method == 'GET':
         return meta_data.password
     elif req.method == 'POST':
@@ -63,14 +59,27 @@ def handle_password(req, meta_data):
         #             a short window.
         if meta_data.password:
             raise exc.HTTPConflict()
-        if (req.content_length > MAX_SIZE or len(req.body) > MAX_SIZE):
+        # NOTE: Check the declared length first so that oversized requests
+        #       are rejected without reading the body into memory. Chunked
+        #       requests have no Content-Length and rely on the body check.
+        content_length = req.content_length
+        if content_length is not None and content_length > MAX_SIZE:
+            msg = _("Request is too large.")
+            raise exc.HTTPBadRequest(explanation=msg)
+        body = req.body
+        if len(body) > MAX_SIZE:
             msg = _("Request is too large.")
             raise exc.HTTPBadRequest(explanation=msg)
 
+        ctxt = context.get_admin_context()
         im = objects.InstanceMapping.get_by_instance_uuid(ctxt, meta_data.uuid)
         with context.target_cell(ctxt, im.cell_mapping) as cctxt:
-            instance = objects.Instance.get_by_uuid(cctxt, meta_data.uuid)
-        instance.system_metadata.update(convert_password(ctxt, req.body))
+            # NOTE: Join system_metadata up front; it is the only thing
+            #       updated here and would otherwise be lazy-loaded with a
+            #       second round trip.
+            instance = objects.Instance.get_by_uuid(
+                cctxt, meta_data.uuid, expected_attrs=['system_metadata'])
+        instance.system_metadata.update(convert_password(ctxt, body))
         instance.save()
     else:
         raise exc.HTTPBadRequest()
@@ -35,19 +35,18 @@ from nova import wsgi as base_wsgi
 LOG = logging.getLogger(__name__)
 CONF = nova.conf.CONF
 
+# NOTE: Built once at import time so the fault path does not have to walk
+# the webob exception hierarchy (or check whether it already has) per request.
+_STATUS_TO_TYPE = {clazz.code: clazz for clazz in
+                   utils.walk_class_hierarchy(webob.exc.HTTPError)}
+
 
 class FaultWrapper(base_wsgi.Middleware):
     """Calls down the middleware stack, making exceptions into faults."""
 
-    _status_to_type = {}
-
     @staticmethod
     def status_to_type(status):
-        if not FaultWrapper._status_to_type:
-            for clazz in utils.walk_class_hierarchy(webob.exc.HTTPError):
-                FaultWrapper._status_to_type[clazz.code] = clazz
-        return FaultWrapper._status_to_type.get(
-                                  status, webob.exc.HTTPInternalServerError)()
+        return _STATUS_TO_TYPE.get(status, webob.exc.HTTPInternalServerError)()
 
     def _error(self, inner, req):
         LOG.exception("Caught error: %s", inner)
@@ -145,9 +144,13 @@ class APIMapper(routes.Mapper):
         # NOTE(vish): Default the format part of a route to only accept json
         #             and xml so it doesn't eat all characters after a '.'
         #             in the url.
-        kargs.setdefault('requirements', {})
-        if not kargs['requirements'].get('format'):
-            kargs['requirements']['format'] = 'json|xml'
+        # NOTE: routes stores inline requirements (e.g. {project_id:...})
+        #       into this dict, so each route needs its own copy.
+        reqs = kargs.get('requirements')
+        if reqs is None:
+            kargs['requirements'] = {'format': 'json|xml'}
+        elif not reqs.get('format'):
+            reqs['format'] = 'json|xml'
         return routes.Mapper.connect(self, *args, **kargs)
 
 
@@ -251,10 +254,11 @@ class APIRouterV21(base_wsgi.Router):
 
         # NOTE(cyeoh) Core API support is rewritten as extensions
         # but conceptually still have core
-        if list(self.api_extension_manager):
+        extensions = list(self.api_extension_manager)
+        if extensions:
             # NOTE(cyeoh): Stevedore raises an exception if there are
             # no plugins detected. I wonder if this is a bug.
-            self._register_resources_check_inherits(mapper)
+            self._register_resources_check_inherits(extensions, mapper)
             self.api_extension_manager.map(self._register_controllers)
 
         LOG.info("Loaded extensions: %s",
@@ -265,11 +269,11 @@ class APIRouterV21(base_wsgi.Router):
         for ext in ext_list:
             self._register_resources(ext, mapper)
 
-    def _register_resources_check_inherits(self, mapper):
+    def _register_resources_check_inherits(self, extensions, mapper):
         ext_has_inherits = []
         ext_no_inherits = []
 
-        for ext in self.api_extension_manager:
+        for ext in extensions:
             for resource in ext.obj.get_resources():
                 if resource.inherits:
                     ext_has_inherits.append(ext)
@@ -297,17 +301,22 @@ class APIRouterV21(base_wsgi.Router):
         handler = ext.obj
         LOG.debug("Running _register_resources on %s", ext.obj)
 
+        # NOTE: This runs for every resource of every extension at startup,
+        # so keep the lookups used inside the loop local.
+        resources = self.resources
+        mapper_resource = mapper.resource
+
         for resource in handler.get_resources():
             LOG.debug('Extended resource: %s', resource.collection)
 
             inherits = None
             if resource.inherits:
-                inherits = self.resources.get(resource.inherits)
+                inherits = resources.get(resource.inherits)
                 if not resource.controller:
                     resource.controller = inherits.controller
             wsgi_resource = wsgi.ResourceV21(resource.controller,
                                              inherits=inherits)
-            self.resources[resource.collection] = wsgi_resource
+            resources[resource.collection] = wsgi_resource
             kargs = dict(
                 controller=wsgi_resource,
                 collection=resource.collection_actions,
@@ -323,8 +332,7 @@ class APIRouterV21(base_wsgi.Router):
                 member_name = resource.member_name
             else:
                 member_name = resource.collection
-            mapper.resource(member_name, resource.collection,
-                            **kargs)
+            mapper_resource(member_name, resource.collection, **kargs)
 
             if resource.custom_routes_fn:
                 resource.custom_routes_fn(mapper, wsgi_resource)
@@ -13,6 +13,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import itertools
+
 from keystoneauth1 import loading as ks_loading
 from oslo_config import cfg
 
@@ -105,7 +107,7 @@ Related options:
 """),
 ]
 
-ALL_OPTS = (neutron_opts + metadata_proxy_opts)
+ALL_OPTS = tuple(itertools.chain(neutron_opts, metadata_proxy_opts))
 
 
 def register_opts(conf):
@@ -115,13 +117,28 @@ def register_opts(conf):
     ks_loading.register_auth_conf_options(conf, NEUTRON_GROUP)
 
 
-def list_opts():
-    return {
-        neutron_group: (
-            ALL_OPTS +
+_plugin_opts = None
+
+
+def _gen_opts_from_plugins():
+    """Return the keystoneauth session and auth plugin options.
+
+    Loading the auth plugins is not free and their options never change at
+    runtime, so the result is computed once and reused.
+    """
+    global _plugin_opts
+    if _plugin_opts is None:
+        _plugin_opts = (
             ks_loading.get_session_conf_options() +
             ks_loading.get_auth_common_conf_options() +
             ks_loading.get_auth_plugin_conf_options('password') +
             ks_loading.get_auth_plugin_conf_options('v2password') +
             ks_loading.get_auth_plugin_conf_options('v3password'))
+    return _plugin_opts
+
+
+def list_opts():
+    return {
+        neutron_group: list(itertools.chain(ALL_OPTS,
+                                            _gen_opts_from_plugins()))
     }
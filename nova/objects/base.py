@@ -32,6 +32,16 @@ from nova.objects import fields as obj_fields
 from nova import utils
 
 
+# Types that NovaObjectSerializer passes through untouched in both directions.
+_SCALAR_TYPES = frozenset(six.string_types + six.integer_types +
+                          (six.text_type, six.binary_type, float, bool,
+                           type(None)))
+
+
+def _only_scalars(values):
+    return all(type(value) in _SCALAR_TYPES for value in values)
+
+
 def get_attrname(name):
     """Return the mangled name of the attribute's underlying storage."""
     # FIXME(danms): This is just until we use o.vo's class properties
@@ -47,13 +57,14 @@ class NovaObjectRegistry(ovoo_base.VersionedObjectRegistry):
         # and is responsible for maintaining nova.objects.$OBJECT
         # as the highest-versioned implementation of a given object.
         version = versionutils.convert_version_to_tuple(cls.VERSION)
-        if not hasattr(objects, cls.obj_name()):
-            setattr(objects, cls.obj_name(), cls)
+        obj_name = cls.obj_name()
+        if not hasattr(objects, obj_name):
+            setattr(objects, obj_name, cls)
         else:
             cur_version = versionutils.convert_version_to_tuple(
-                getattr(objects, cls.obj_name()).VERSION)
+                getattr(objects, obj_name).VERSION)
             if version >= cur_version:
-                setattr(objects, cls.obj_name(), cls)
+                setattr(objects, obj_name, cls)
 
     @classmethod
     def register_notification(cls, notification_cls):
@@ -222,10 +233,27 @@ class NovaObjectSerializer(messaging.NoOpSerializer):
         :param:context: Request context
         :param:action_fn: Action to take on each item in values
         :param:values: Iterable container of things to take action on
-        :returns: A new container of the same type (except set) with
-                  items from values having had action applied.
+        :returns: A container of the same type (except set, which becomes a
+                  list) with items from values having had action applied.
+                  Tuples holding only scalars are immutable and are returned
+                  as-is; every other container is a new object.
         """
         iterable = values.__class__
+        # NOTE: Plain dicts, lists and tuples are handled directly, and those
+        # holding only scalars are copied without calling action_fn per item.
+        if iterable is dict:
+            if _only_scalars(six.itervalues(values)):
+                return dict(values)
+            return {k: action_fn(context, v) for k, v in values.items()}
+        elif iterable is list or iterable is set:
+            if _only_scalars(values):
+                return list(values)
+            return [action_fn(context, value) for value in values]
+        elif iterable is tuple:
+            if _only_scalars(values):
+                return values
+            return tuple([action_fn(context, value) for value in values])
+
         if issubclass(iterable, dict):
             return iterable(**{k: action_fn(context, v)
                             for k, v in values.items()})
@@ -263,20 +291,30 @@ def obj_to_primitive(obj):
     A NovaObject becomes a dict, and anything that implements ObjectListBase
     becomes a list.
     """
-    if isinstance(obj, ObjectListBase):
-        return [obj_to_primitive(x) for x in obj]
-    elif isinstance(obj, NovaObject):
-        result = {}
-        for key in obj.obj_fields:
-            if obj.obj_attr_is_set(key) or key in obj.obj_extra_fields:
-                result[key] = obj_to_primitive(getattr(obj, key))
-        return result
-    elif isinstance(obj, netaddr.IPAddress):
-        return str(obj)
-    elif isinstance(obj, netaddr.IPNetwork):
-        return str(obj)
-    else:
-        return obj
+    # NOTE: The graph is walked with an explicit stack instead of recursing
+    # per attribute. Each entry holds the item to convert plus the container
+    # and key its primitive is stored under.
+    result = [None]
+    stack = [(obj, result, 0)]
+    while stack:
+        item, container, key = stack.pop()
+        if isinstance(item, ObjectListBase):
+            value = [None] * len(item)
+            for index, child in enumerate(item):
+                stack.append((child, value, index))
+        elif isinstance(item, NovaObject):
+            value = {}
+            for name in item.obj_fields:
+                if item.obj_attr_is_set(name) or name in item.obj_extra_fields:
+                    # Reserve the slot so the result keeps field order
+                    value[name] = None
+                    stack.append((getattr(item, name), value, name))
+        elif isinstance(item, (netaddr.IPAddress, netaddr.IPNetwork)):
+            value = str(item)
+        else:
+            value = item
+        container[key] = value
+    return result[0]
 
 
 def obj_make_dict_of_lists(context, list_cls, obj_list, item_key):
@@ -301,27 +339,43 @@ def obj_make_dict_of_lists(context, list_cls, obj_list, item_key):
     return obj_lists
 
 
-def serialize_args(fn):
-    """Decorator that will do the arguments serialization before remoting."""
-    def wrapper(obj, *args, **kwargs):
+def _serialize_call_args(args, kwargs):
+    """Serialize datetimes and exception details in remoted call arguments."""
+    if any(isinstance(arg, datetime.datetime) for arg in args):
         args = [utils.strtime(arg) if isinstance(arg, datetime.datetime)
                 else arg for arg in args]
-        for k, v in kwargs.items():
-            if k == 'exc_val' and v:
-                kwargs[k] = six.text_type(v)
-            elif k == 'exc_tb' and v and not isinstance(v, six.string_types):
-                kwargs[k] = ''.join(traceback.format_tb(v))
-            elif isinstance(v, datetime.datetime):
-                kwargs[k] = utils.strtime(v)
-        if hasattr(fn, '__call__'):
+    # NOTE: exc_val and exc_tb are probed directly rather than compared
+    # against every keyword name, leaving the loop to handle datetimes.
+    exc_val = kwargs.get('exc_val')
+    exc_tb = kwargs.get('exc_tb')
+    for k, v in kwargs.items():
+        if isinstance(v, datetime.datetime):
+            kwargs[k] = utils.strtime(v)
+    if exc_val:
+        kwargs['exc_val'] = six.text_type(exc_val)
+    if exc_tb and not isinstance(exc_tb, six.string_types):
+        kwargs['exc_tb'] = ''.join(traceback.format_tb(exc_tb))
+    return args, kwargs
+
+
+def serialize_args(fn):
+    """Decorator that will do the arguments serialization before remoting."""
+    is_callable = hasattr(fn, '__call__')
+
+    if is_callable:
+        def wrapper(obj, *args, **kwargs):
+            args, kwargs = _serialize_call_args(args, kwargs)
             return fn(obj, *args, **kwargs)
-        # NOTE(danms): We wrap a descriptor, so use that protocol
-        return fn.__get__(None, obj)(*args, **kwargs)
+    else:
+        def wrapper(obj, *args, **kwargs):
+            args, kwargs = _serialize_call_args(args, kwargs)
+            # NOTE(danms): We wrap a descriptor, so use that protocol
+            return fn.__get__(None, obj)(*args, **kwargs)
 
     # NOTE(danms): Make this discoverable
     wrapper.remotable = getattr(fn, 'remotable', False)
     wrapper.original_fn = fn
-    return (functools.wraps(fn)(wrapper) if hasattr(fn, '__call__')
+    return (functools.wraps(fn)(wrapper) if is_callable
             else classmethod(wrapper))
 
 
@@ -341,20 +395,28 @@ def obj_equal_prims(obj_1, obj_2, ignore=None):
     """
 
     def _strip(prim, keys):
-        if isinstance(prim, dict):
-            for k in keys:
-                prim.pop(k, None)
-            for v in prim.values():
-                _strip(v, keys)
-        if isinstance(prim, list):
-            for v in prim:
-                _strip(v, keys)
+        stack = [prim]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, dict):
+                for k in keys:
+                    item.pop(k, None)
+                stack.extend(item.values())
+            elif isinstance(item, list):
+                stack.extend(item)
         return prim
 
     if ignore is not None:
-        keys = ['nova_object.changes'] + ignore
+        keys = tuple(['nova_object.changes'] + ignore)
     else:
-        keys = ['nova_object.changes']
+        keys = ('nova_object.changes',)
+
+    # Objects of different types can never have equal primitives, so avoid
+    # serializing them at all unless the caller asked to ignore the name.
+    if ('nova_object.name' not in keys and
+            obj_1.obj_name() != obj_2.obj_name()):
+        return False
+
     prim_1 = _strip(obj_1.obj_to_primitive(), keys)
     prim_2 = _strip(obj_2.obj_to_primitive(), keys)
     return prim_1 == prim_2
@@ -15,6 +15,7 @@
 import os
 
 import fixtures
+import six
 
 import nova.conf
 from nova.conf import paths
@@ -25,6 +26,11 @@ CONF = nova.conf.CONF
 
 class ApiPasteV21Fixture(fixtures.Fixture):
 
+    # NOTE: The fixture is installed for every API test, so the rewritten
+    # paste config is kept per fixture class and source file instead of
+    # re-reading and rewriting the original file each time.
+    _rewritten_configs = {}
+
     def _replace_line(self, target_file, line):
         # TODO(johnthetubaguy) should really point the tests at /v2.1
         target_file.write(line.replace(
@@ -39,13 +45,22 @@ class ApiPasteV21Fixture(fixtures.Fixture):
         tmp_api_paste_dir = self.useFixture(fixtures.TempDir())
         tmp_api_paste_file_name = os.path.join(tmp_api_paste_dir.path,
                                                'fake_api_paste.ini')
-        with open(CONF.wsgi.api_paste_config, 'r') as orig_api_paste:
-            with open(tmp_api_paste_file_name, 'w') as tmp_file:
-                for line in orig_api_paste:
-                    self._replace_line(tmp_file, line)
+        with open(tmp_api_paste_file_name, 'w') as tmp_file:
+            tmp_file.write(
+                self._rewritten_config(CONF.wsgi.api_paste_config))
         CONF.set_override('api_paste_config', tmp_api_paste_file_name,
                           group='wsgi')
 
+    def _rewritten_config(self, path):
+        key = (type(self), path)
+        if key not in self._rewritten_configs:
+            rewritten = six.StringIO()
+            with open(path, 'r') as orig_api_paste:
+                for line in orig_api_paste:
+                    self._replace_line(rewritten, line)
+            self._rewritten_configs[key] = rewritten.getvalue()
+        return self._rewritten_configs[key]
+
 
 class ApiPasteNoProjectId(ApiPasteV21Fixture):
 
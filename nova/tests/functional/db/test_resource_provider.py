@@ -49,7 +49,6 @@ class ResourceProviderBaseCase(test.NoDBTestCase):
 
     def setUp(self):
         super(ResourceProviderBaseCase, self).setUp()
-        self.useFixture(fixtures.Database())
         self.api_db = self.useFixture(fixtures.Database(database='api'))
         self.context = context.RequestContext('fake-user', 'fake-project')
 
@@ -379,9 +378,9 @@ class ResourceProviderTestCase(ResourceProviderBaseCase):
         new_inv_list = objects.InventoryList.get_all_by_resource_provider_uuid(
                 self.context, uuidsentinel.rp_uuid)
         self.assertEqual(2, len(new_inv_list))
-        resource_classes = [inv.resource_class for inv in new_inv_list]
-        self.assertIn(fields.ResourceClass.VCPU, resource_classes)
-        self.assertIn(fields.ResourceClass.DISK_GB, resource_classes)
+        self.assertEqual(
+            set([fields.ResourceClass.VCPU, fields.ResourceClass.DISK_GB]),
+            set(inv.resource_class for inv in new_inv_list))
 
         # reset list to just disk_inv
         inv_list = objects.InventoryList(objects=[disk_inv])
@@ -394,9 +393,8 @@ class ResourceProviderTestCase(ResourceProviderBaseCase):
         new_inv_list = objects.InventoryList.get_all_by_resource_provider_uuid(
                 self.context, uuidsentinel.rp_uuid)
         self.assertEqual(1, len(new_inv_list))
-        resource_classes = [inv.resource_class for inv in new_inv_list]
-        self.assertNotIn(fields.ResourceClass.VCPU, resource_classes)
-        self.assertIn(fields.ResourceClass.DISK_GB, resource_classes)
+        self.assertEqual(fields.ResourceClass.DISK_GB,
+                         new_inv_list[0].resource_class)
         self.assertEqual(1024, new_inv_list[0].total)
 
         # update existing disk inv to new settings
@@ -443,17 +441,12 @@ class ResourceProviderTestCase(ResourceProviderBaseCase):
         self.assertEqual(saved_generation + 1, rp.generation)
         saved_generation = rp.generation
 
-        new_inv_list = objects.InventoryList.get_all_by_resource_provider_uuid(
-                self.context, uuidsentinel.rp_uuid)
-        result = new_inv_list.find(fields.ResourceClass.DISK_GB)
-        self.assertIsNone(result)
-        self.assertRaises(exception.NotFound, rp.delete_inventory,
-                          fields.ResourceClass.DISK_GB)
-
         # check inventory list is empty
         inv_list = objects.InventoryList.get_all_by_resource_provider_uuid(
                 self.context, uuidsentinel.rp_uuid)
         self.assertEqual(0, len(inv_list))
+        self.assertRaises(exception.NotFound, rp.delete_inventory,
+                          fields.ResourceClass.DISK_GB)
 
         # add some inventory
         rp.add_inventory(vcpu_inv)
@@ -569,11 +562,6 @@ class ResourceProviderTestCase(ResourceProviderBaseCase):
 
 
 class ResourceProviderListTestCase(ResourceProviderBaseCase):
-    def setUp(self):
-        super(ResourceProviderListTestCase, self).setUp()
-        self.useFixture(fixtures.Database())
-        self.useFixture(fixtures.Database(database='api'))
-        self.context = context.RequestContext('fake-user', 'fake-project')
 
     def test_get_all_by_filters(self):
         for rp_i in ['1', '2']:
@@ -589,7 +577,7 @@ class ResourceProviderListTestCase(ResourceProviderBaseCase):
             self.context, filters={'name': u'rp_name_1'})
         self.assertEqual(1, len(resource_providers))
         resource_providers = objects.ResourceProviderList.get_all_by_filters(
-            self.context, filters={'uuid': getattr(uuidsentinel, 'rp_uuid_2')})
+            self.context, filters={'uuid': uuidsentinel.rp_uuid_2})
         self.assertEqual(1, len(resource_providers))
         self.assertEqual('rp_name_2', resource_providers[0].name)
 
@@ -747,7 +735,6 @@ class TestResourceProviderAggregates(test.NoDBTestCase):
 
     def setUp(self):
         super(TestResourceProviderAggregates, self).setUp()
-        self.useFixture(fixtures.Database(database='main'))
         self.useFixture(fixtures.Database(database='api'))
         self.context = context.RequestContext('fake-user', 'fake-project')
 
@@ -946,12 +933,10 @@ class TestAllocation(ResourceProviderBaseCase):
             self.context, rp2.uuid)
         self.assertEqual(1, len(allocations))
         self.assertEqual(rp2.uuid, allocations[0].resource_provider.uuid)
-        self.assertIn(fields.ResourceClass.DISK_GB,
-                      [allocation.resource_class
-                       for allocation in allocations])
-        self.assertNotIn(fields.ResourceClass.IPV4_ADDRESS,
-                      [allocation.resource_class
-                       for allocation in allocations])
+        resource_classes = set(allocation.resource_class
+                               for allocation in allocations)
+        self.assertIn(fields.ResourceClass.DISK_GB, resource_classes)
+        self.assertNotIn(fields.ResourceClass.IPV4_ADDRESS, resource_classes)
 
 
 class TestAllocationListCreateDelete(ResourceProviderBaseCase):
@@ -32,22 +32,18 @@ For postgres on Ubuntu this can be done with the following commands::
 
 """
 
-import glob
 import os
 
 from migrate import UniqueConstraint
-from migrate.versioning import repository
 import mock
 from oslo_db.sqlalchemy import test_base
 from oslo_db.sqlalchemy import test_migrations
 from oslo_db.sqlalchemy import utils as oslodbutils
 import sqlalchemy
 from sqlalchemy.engine import reflection
-import sqlalchemy.exc
 from sqlalchemy.sql import null
 
 from nova.db import migration
-from nova.db.sqlalchemy import migrate_repo
 from nova.db.sqlalchemy import migration as sa_migration
 from nova.db.sqlalchemy import models
 from nova.db.sqlalchemy import utils as db_utils
@@ -75,8 +71,7 @@ class NovaMigrationsCheckers(test_migrations.ModelsMigrationsSync,
 
     @property
     def REPOSITORY(self):
-        return repository.Repository(
-            os.path.abspath(os.path.dirname(migrate_repo.__file__)))
+        return sa_migration._find_migrate_repo()
 
     @property
     def migration_api(self):
@@ -110,9 +105,24 @@ class NovaMigrationsCheckers(test_migrations.ModelsMigrationsSync,
         self.assertFalse(oslodbutils.column_exists(engine, table_name, column),
                         'Column %s.%s should not exist' % (table_name, column))
 
+    def assertColumnType(self, engine, table_name, column, type_):
+        """Assert that a column exists and is of the given type.
+
+        The table is reflected only once and is returned so that callers can
+        make further assertions against it.
+        """
+        table = oslodbutils.get_table(engine, table_name)
+        self.assertIn(column, table.c,
+                      'Column %s.%s does not exist' % (table_name, column))
+        self.assertIsInstance(table.c[column].type, type_)
+        return table
+
     def assertTableNotExists(self, engine, table):
-        self.assertRaises(sqlalchemy.exc.NoSuchTableError,
-                          oslodbutils.get_table, engine, table)
+        # NOTE: has_table is a single catalog lookup, whereas reflecting a
+        # missing table runs several queries before raising NoSuchTableError.
+        with engine.connect() as conn:
+            self.assertFalse(engine.dialect.has_table(conn, table),
+                             'Table %s exists' % table)
 
     def assertIndexExists(self, engine, table_name, index):
         self.assertTrue(oslodbutils.index_exists(engine, table_name, index),
@@ -128,17 +138,21 @@ class NovaMigrationsCheckers(test_migrations.ModelsMigrationsSync,
         # NOTE(johannes): Order of columns can matter. Most SQL databases
         # can use the leading columns for optimizing queries that don't
         # include all of the covered columns.
-        self.assertIndexExists(engine, table, index)
-
         t = oslodbutils.get_table(engine, table)
-        index_columns = None
-        for idx in t.indexes:
-            if idx.name == index:
-                index_columns = [c.name for c in idx.columns]
-                break
+        index_columns = next((
+            [c.name for c in idx.columns]
+            for idx in t.indexes if idx.name == index), None)
 
+        self.assertIsNotNone(index_columns,
+                             'Index %s on table %s does not exist' %
+                             (index, table))
         self.assertEqual(members, index_columns)
 
+    def _index_columns(self, table):
+        """Map each index on a reflected table to its column names."""
+        return {idx.name: tuple(c.name for c in idx.columns)
+                for idx in table.indexes}
+
     # Implementations for ModelsMigrationsSync
     def db_sync(self, engine):
         with mock.patch.object(sa_migration, 'get_engine',
@@ -162,35 +176,25 @@ class NovaMigrationsCheckers(test_migrations.ModelsMigrationsSync,
 
         return True
 
-    def _skippable_migrations(self):
-        special = [
-            216,  # Havana
-            272,  # NOOP migration due to revert
-        ]
-
-        havana_placeholders = list(range(217, 227))
-        icehouse_placeholders = list(range(235, 244))
-        juno_placeholders = list(range(255, 265))
-        kilo_placeholders = list(range(281, 291))
-        liberty_placeholders = list(range(303, 313))
-        mitaka_placeholders = list(range(320, 330))
-        newton_placeholders = list(range(335, 345))
-        ocata_placeholders = list(range(348, 358))
-
-        return (special +
-                havana_placeholders +
-                icehouse_placeholders +
-                juno_placeholders +
-                kilo_placeholders +
-                liberty_placeholders +
-                mitaka_placeholders +
-                newton_placeholders +
-                ocata_placeholders)
+    # NOTE: Placeholder migrations and other versions that do not need a
+    # _check_NNN method. Built once since migrate_up consults it per version.
+    _SKIPPABLE_MIGRATIONS = frozenset(
+        [216,  # Havana
+         272,  # NOOP migration due to revert
+         ] +
+        list(range(217, 227)) +  # Havana placeholders
+        list(range(235, 244)) +  # Icehouse placeholders
+        list(range(255, 265)) +  # Juno placeholders
+        list(range(281, 291)) +  # Kilo placeholders
+        list(range(303, 313)) +  # Liberty placeholders
+        list(range(320, 330)) +  # Mitaka placeholders
+        list(range(335, 345)) +  # Newton placeholders
+        list(range(348, 358)))   # Ocata placeholders
 
     def migrate_up(self, version, with_data=False):
         if with_data:
             check = getattr(self, "_check_%03d" % version, None)
-            if version not in self._skippable_migrations():
+            if version not in self._SKIPPABLE_MIGRATIONS:
                 self.assertIsNotNone(check,
                                      ('DB Migration %i does not have a '
                                       'test. Please add one!') % version)
@@ -250,41 +254,32 @@ class NovaMigrationsCheckers(test_migrations.ModelsMigrationsSync,
         table.insert().execute(fake_quotas)
 
         # Check we can get the longest resource name.
-        quota = table.select(table.c.id == 5).execute().first()
-        self.assertEqual(quota['resource'], 'injected_file_content_bytes')
+        resource = engine.execute(
+            sqlalchemy.select([table.c.resource]).where(table.c.id == 5)
+        ).scalar()
+        self.assertEqual(resource, 'injected_file_content_bytes')
 
     def _check_228(self, engine, data):
-        self.assertColumnExists(engine, 'compute_nodes', 'metrics')
-
-        compute_nodes = oslodbutils.get_table(engine, 'compute_nodes')
-        self.assertIsInstance(compute_nodes.c.metrics.type,
+        self.assertColumnType(engine, 'compute_nodes', 'metrics',
                               sqlalchemy.types.Text)
 
     def _check_229(self, engine, data):
-        self.assertColumnExists(engine, 'compute_nodes', 'extra_resources')
-
-        compute_nodes = oslodbutils.get_table(engine, 'compute_nodes')
-        self.assertIsInstance(compute_nodes.c.extra_resources.type,
+        self.assertColumnType(engine, 'compute_nodes', 'extra_resources',
                               sqlalchemy.types.Text)
 
     def _check_230(self, engine, data):
-        for table_name in ['instance_actions_events',
-                           'shadow_instance_actions_events']:
-            self.assertColumnExists(engine, table_name, 'host')
-            self.assertColumnExists(engine, table_name, 'details')
-
-        action_events = oslodbutils.get_table(engine,
-                                              'instance_actions_events')
-        self.assertIsInstance(action_events.c.host.type,
-                              sqlalchemy.types.String)
-        self.assertIsInstance(action_events.c.details.type,
-                              sqlalchemy.types.Text)
+        shadow = oslodbutils.get_table(engine,
+                                       'shadow_instance_actions_events')
+        self.assertIn('host', shadow.c)
+        self.assertIn('details', shadow.c)
 
-    def _check_231(self, engine, data):
-        self.assertColumnExists(engine, 'instances', 'ephemeral_key_uuid')
+        table = self.assertColumnType(engine, 'instance_actions_events',
+                                      'host', sqlalchemy.types.String)
+        self.assertIn('details', table.c)
+        self.assertIsInstance(table.c.details.type, sqlalchemy.types.Text)
 
-        instances = oslodbutils.get_table(engine, 'instances')
-        self.assertIsInstance(instances.c.ephemeral_key_uuid.type,
+    def _check_231(self, engine, data):
+        self.assertColumnType(engine, 'instances', 'ephemeral_key_uuid',
                               sqlalchemy.types.String)
         self.assertTrue(db_utils.check_shadow_table(engine, 'instances'))
 
@@ -296,14 +291,10 @@ class NovaMigrationsCheckers(test_migrations.ModelsMigrationsSync,
             self.assertTableNotExists(engine, 'dump_' + table_name)
 
     def _check_233(self, engine, data):
-        self.assertColumnExists(engine, 'compute_nodes', 'stats')
-
-        compute_nodes = oslodbutils.get_table(engine, 'compute_nodes')
-        self.assertIsInstance(compute_nodes.c.stats.type,
+        self.assertColumnType(engine, 'compute_nodes', 'stats',
                               sqlalchemy.types.Text)
 
-        self.assertRaises(sqlalchemy.exc.NoSuchTableError,
-                          oslodbutils.get_table, engine, 'compute_node_stats')
+        self.assertTableNotExists(engine, 'compute_node_stats')
 
     def _check_234(self, engine, data):
         self.assertIndexMembers(engine, 'reservations',
@@ -323,7 +314,11 @@ class NovaMigrationsCheckers(test_migrations.ModelsMigrationsSync,
 
     def _check_245(self, engine, data):
         networks = oslodbutils.get_table(engine, 'networks')
-        network = networks.select(networks.c.id == 1).execute().first()
+        network = engine.execute(
+            sqlalchemy.select([networks.c.mtu, networks.c.dhcp_server,
+                               networks.c.enable_dhcp,
+                               networks.c.share_address]).where(
+                networks.c.id == 1)).first()
         # mtu should default to None
         self.assertIsNone(network.mtu)
         # dhcp_server should default to None
@@ -335,8 +330,8 @@ class NovaMigrationsCheckers(test_migrations.ModelsMigrationsSync,
 
     def _check_246(self, engine, data):
         pci_devices = oslodbutils.get_table(engine, 'pci_devices')
-        self.assertEqual(1, len([fk for fk in pci_devices.foreign_keys
-                                 if fk.parent.name == 'compute_node_id']))
+        self.assertEqual(1, sum(1 for fk in pci_devices.foreign_keys
+                                 if fk.parent.name == 'compute_node_id'))
 
     def _check_247(self, engine, data):
         quota_usages = oslodbutils.get_table(engine, 'quota_usages')
@@ -357,25 +352,18 @@ class NovaMigrationsCheckers(test_migrations.ModelsMigrationsSync,
         # Assert that only one index exists that covers columns
         # instance_uuid and device_name
         bdm = oslodbutils.get_table(engine, 'block_device_mapping')
-        self.assertEqual(1, len([i for i in bdm.indexes
-                                 if [c.name for c in i.columns] ==
-                                    ['instance_uuid', 'device_name']]))
+        index_columns = self._index_columns(bdm).values()
+        self.assertEqual(1, sum(1 for cols in index_columns
+                                 if cols == ('instance_uuid', 'device_name')))
 
     def _check_250(self, engine, data):
         self.assertTableNotExists(engine, 'instance_group_metadata')
         self.assertTableNotExists(engine, 'shadow_instance_group_metadata')
 
     def _check_251(self, engine, data):
-        self.assertColumnExists(engine, 'compute_nodes', 'numa_topology')
-        self.assertColumnExists(engine, 'shadow_compute_nodes',
-                                'numa_topology')
-
-        compute_nodes = oslodbutils.get_table(engine, 'compute_nodes')
-        shadow_compute_nodes = oslodbutils.get_table(engine,
-                                                     'shadow_compute_nodes')
-        self.assertIsInstance(compute_nodes.c.numa_topology.type,
+        self.assertColumnType(engine, 'compute_nodes', 'numa_topology',
                               sqlalchemy.types.Text)
-        self.assertIsInstance(shadow_compute_nodes.c.numa_topology.type,
+        self.assertColumnType(engine, 'shadow_compute_nodes', 'numa_topology',
                               sqlalchemy.types.Text)
 
     def _check_252(self, engine, data):
@@ -386,53 +374,35 @@ class NovaMigrationsCheckers(test_migrations.ModelsMigrationsSync,
                                 ['instance_uuid'])
 
     def _check_253(self, engine, data):
-        self.assertColumnExists(engine, 'instance_extra', 'pci_requests')
-        self.assertColumnExists(
-            engine, 'shadow_instance_extra', 'pci_requests')
-        instance_extra = oslodbutils.get_table(engine, 'instance_extra')
-        shadow_instance_extra = oslodbutils.get_table(engine,
-                                                      'shadow_instance_extra')
-        self.assertIsInstance(instance_extra.c.pci_requests.type,
+        self.assertColumnType(engine, 'instance_extra', 'pci_requests',
                               sqlalchemy.types.Text)
-        self.assertIsInstance(shadow_instance_extra.c.pci_requests.type,
+        self.assertColumnType(engine, 'shadow_instance_extra', 'pci_requests',
                               sqlalchemy.types.Text)
 
     def _check_254(self, engine, data):
-        self.assertColumnExists(engine, 'pci_devices', 'request_id')
-        self.assertColumnExists(
-            engine, 'shadow_pci_devices', 'request_id')
-
-        pci_devices = oslodbutils.get_table(engine, 'pci_devices')
-        shadow_pci_devices = oslodbutils.get_table(
-            engine, 'shadow_pci_devices')
-        self.assertIsInstance(pci_devices.c.request_id.type,
+        self.assertColumnType(engine, 'pci_devices', 'request_id',
                               sqlalchemy.types.String)
-        self.assertIsInstance(shadow_pci_devices.c.request_id.type,
+        self.assertColumnType(engine, 'shadow_pci_devices', 'request_id',
                               sqlalchemy.types.String)
 
     def _check_265(self, engine, data):
         # Assert that only one index exists that covers columns
         # host and deleted
         instances = oslodbutils.get_table(engine, 'instances')
-        self.assertEqual(1, len([i for i in instances.indexes
-                                 if [c.name for c in i.columns][:2] ==
-                                    ['host', 'deleted']]))
+        index_columns = self._index_columns(instances).values()
+        self.assertEqual(1, sum(1 for cols in index_columns
+                                 if cols[:2] == ('host', 'deleted')))
         # and only one index covers host column
         iscsi_targets = oslodbutils.get_table(engine, 'iscsi_targets')
-        self.assertEqual(1, len([i for i in iscsi_targets.indexes
-                                 if [c.name for c in i.columns][:1] ==
-                                    ['host']]))
+        index_columns = self._index_columns(iscsi_targets).values()
+        self.assertEqual(1, sum(1 for cols in index_columns
+                                 if cols[:1] == ('host',)))
 
     def _check_266(self, engine, data):
-        self.assertColumnExists(engine, 'tags', 'resource_id')
-        self.assertColumnExists(engine, 'tags', 'tag')
-
-        table = oslodbutils.get_table(engine, 'tags')
-
-        self.assertIsInstance(table.c.resource_id.type,
-                              sqlalchemy.types.String)
-        self.assertIsInstance(table.c.tag.type,
-                              sqlalchemy.types.String)
+        table = self.assertColumnType(engine, 'tags', 'resource_id',
+                                      sqlalchemy.types.String)
+        self.assertIn('tag', table.c)
+        self.assertIsInstance(table.c.tag.type, sqlalchemy.types.String)
 
     def _pre_upgrade_267(self, engine):
         # Create a fixed_ips row with a null instance_uuid (if not already
@@ -523,40 +493,24 @@ class NovaMigrationsCheckers(test_migrations.ModelsMigrationsSync,
     def _check_268(self, engine, data):
         # We can only assert that the col exists, not the unique constraint
         # as the engine is running sqlite
-        self.assertColumnExists(engine, 'compute_nodes', 'host')
-        self.assertColumnExists(engine, 'shadow_compute_nodes', 'host')
-        compute_nodes = oslodbutils.get_table(engine, 'compute_nodes')
-        shadow_compute_nodes = oslodbutils.get_table(
-            engine, 'shadow_compute_nodes')
-        self.assertIsInstance(compute_nodes.c.host.type,
+        self.assertColumnType(engine, 'compute_nodes', 'host',
                               sqlalchemy.types.String)
-        self.assertIsInstance(shadow_compute_nodes.c.host.type,
+        self.assertColumnType(engine, 'shadow_compute_nodes', 'host',
                               sqlalchemy.types.String)
 
     def _check_269(self, engine, data):
-
-        self.assertColumnExists(engine, 'pci_devices', 'numa_node')
-        self.assertColumnExists(engine, 'shadow_pci_devices', 'numa_node')
-        pci_devices = oslodbutils.get_table(engine, 'pci_devices')
-        shadow_pci_devices = oslodbutils.get_table(
-            engine, 'shadow_pci_devices')
-        self.assertIsInstance(pci_devices.c.numa_node.type,
-                              sqlalchemy.types.Integer)
+        pci_devices = self.assertColumnType(
+            engine, 'pci_devices', 'numa_node', sqlalchemy.types.Integer)
         self.assertTrue(pci_devices.c.numa_node.nullable)
-        self.assertIsInstance(shadow_pci_devices.c.numa_node.type,
-                              sqlalchemy.types.Integer)
+        shadow_pci_devices = self.assertColumnType(
+            engine, 'shadow_pci_devices', 'numa_node',
+            sqlalchemy.types.Integer)
         self.assertTrue(shadow_pci_devices.c.numa_node.nullable)
 
     def _check_270(self, engine, data):
-        self.assertColumnExists(engine, 'instance_extra', 'flavor')
-        self.assertColumnExists(engine, 'shadow_instance_extra', 'flavor')
-
-        instance_extra = oslodbutils.get_table(engine, 'instance_extra')
-        shadow_instance_extra = oslodbutils.get_table(
-                engine, 'shadow_instance_extra')
-        self.assertIsInstance(instance_extra.c.flavor.type,
+        self.assertColumnType(engine, 'instance_extra', 'flavor',
                               sqlalchemy.types.Text)
-        self.assertIsInstance(shadow_instance_extra.c.flavor.type,
+        self.assertColumnType(engine, 'shadow_instance_extra', 'flavor',
                               sqlalchemy.types.Text)
 
     def _check_271(self, engine, data):
@@ -662,32 +616,21 @@ class NovaMigrationsCheckers(test_migrations.ModelsMigrationsSync,
         key_pairs.insert().execute(fake_keypair)
 
     def _check_275(self, engine, data):
-        self.assertColumnExists(engine, 'key_pairs', 'type')
-        self.assertColumnExists(engine, 'shadow_key_pairs', 'type')
-
-        key_pairs = oslodbutils.get_table(engine, 'key_pairs')
-        shadow_key_pairs = oslodbutils.get_table(engine, 'shadow_key_pairs')
-        self.assertIsInstance(key_pairs.c.type.type,
-                              sqlalchemy.types.String)
-        self.assertIsInstance(shadow_key_pairs.c.type.type,
+        key_pairs = self.assertColumnType(engine, 'key_pairs', 'type',
+                                          sqlalchemy.types.String)
+        self.assertColumnType(engine, 'shadow_key_pairs', 'type',
                               sqlalchemy.types.String)
 
         # Make sure the keypair entry will have the type 'ssh'
-        key_pairs = oslodbutils.get_table(engine, 'key_pairs')
-        keypair = key_pairs.select(
-            key_pairs.c.name == 'test-migr').execute().first()
-        self.assertEqual('ssh', keypair.type)
+        keypair_type = engine.execute(
+            sqlalchemy.select([key_pairs.c.type]).where(
+                key_pairs.c.name == 'test-migr')).scalar()
+        self.assertEqual('ssh', keypair_type)
 
     def _check_276(self, engine, data):
-        self.assertColumnExists(engine, 'instance_extra', 'vcpu_model')
-        self.assertColumnExists(engine, 'shadow_instance_extra', 'vcpu_model')
-
-        instance_extra = oslodbutils.get_table(engine, 'instance_extra')
-        shadow_instance_extra = oslodbutils.get_table(
-                engine, 'shadow_instance_extra')
-        self.assertIsInstance(instance_extra.c.vcpu_model.type,
+        self.assertColumnType(engine, 'instance_extra', 'vcpu_model',
                               sqlalchemy.types.Text)
-        self.assertIsInstance(shadow_instance_extra.c.vcpu_model.type,
+        self.assertColumnType(engine, 'shadow_instance_extra', 'vcpu_model',
                               sqlalchemy.types.Text)
 
     def _check_277(self, engine, data):
@@ -697,8 +640,8 @@ class NovaMigrationsCheckers(test_migrations.ModelsMigrationsSync,
 
     def _check_278(self, engine, data):
         compute_nodes = oslodbutils.get_table(engine, 'compute_nodes')
-        self.assertEqual(0, len([fk for fk in compute_nodes.foreign_keys
-                                 if fk.parent.name == 'service_id']))
+        self.assertEqual(0, sum(1 for fk in compute_nodes.foreign_keys
+                                 if fk.parent.name == 'service_id'))
         self.assertTrue(compute_nodes.c.service_id.nullable)
 
     def _check_279(self, engine, data):
@@ -739,15 +682,9 @@ class NovaMigrationsCheckers(test_migrations.ModelsMigrationsSync,
         self.assertFalse(fake_migration.hidden)
 
     def _check_294(self, engine, data):
-        self.assertColumnExists(engine, 'services', 'last_seen_up')
-        self.assertColumnExists(engine, 'shadow_services', 'last_seen_up')
-
-        services = oslodbutils.get_table(engine, 'services')
-        shadow_services = oslodbutils.get_table(
-                engine, 'shadow_services')
-        self.assertIsInstance(services.c.last_seen_up.type,
+        self.assertColumnType(engine, 'services', 'last_seen_up',
                               sqlalchemy.types.DateTime)
-        self.assertIsInstance(shadow_services.c.last_seen_up.type,
+        self.assertColumnType(engine, 'shadow_services', 'last_seen_up',
                               sqlalchemy.types.DateTime)
 
     def _pre_upgrade_295(self, engine):
@@ -808,17 +745,12 @@ class NovaMigrationsCheckers(test_migrations.ModelsMigrationsSync,
                                 'instance_uuid', ['instance_uuid'])
 
     def _check_313(self, engine, data):
-
-        self.assertColumnExists(engine, 'pci_devices', 'parent_addr')
-        self.assertColumnExists(engine, 'shadow_pci_devices', 'parent_addr')
-        pci_devices = oslodbutils.get_table(engine, 'pci_devices')
-        shadow_pci_devices = oslodbutils.get_table(
-            engine, 'shadow_pci_devices')
-        self.assertIsInstance(pci_devices.c.parent_addr.type,
-                              sqlalchemy.types.String)
+        pci_devices = self.assertColumnType(
+            engine, 'pci_devices', 'parent_addr', sqlalchemy.types.String)
         self.assertTrue(pci_devices.c.parent_addr.nullable)
-        self.assertIsInstance(shadow_pci_devices.c.parent_addr.type,
-                              sqlalchemy.types.String)
+        shadow_pci_devices = self.assertColumnType(
+            engine, 'shadow_pci_devices', 'parent_addr',
+            sqlalchemy.types.String)
         self.assertTrue(shadow_pci_devices.c.parent_addr.nullable)
         self.assertIndexMembers(engine, 'pci_devices',
                         'ix_pci_devices_compute_node_id_parent_addr_deleted',
@@ -978,21 +910,18 @@ class TestNovaMigrationsMySQL(NovaMigrationsCheckers,
                                return_value=self.migrate_engine):
             sa_migration.db_sync()
 
-        total = self.migrate_engine.execute(
-            "SELECT count(*) "
+        # Count all tables and the non-InnoDB ones in a single pass.
+        row = self.migrate_engine.execute(sqlalchemy.text(
+            "SELECT count(*) AS total, "
+            "SUM(CASE WHEN ENGINE != 'InnoDB' "
+            "AND TABLE_NAME != 'migrate_version' "
+            "THEN 1 ELSE 0 END) AS noninnodb "
             "FROM information_schema.TABLES "
-            "WHERE TABLE_SCHEMA = '%(database)s'" %
-            {'database': self.migrate_engine.url.database})
-        self.assertGreater(total.scalar(), 0, "No tables found. Wrong schema?")
+            "WHERE TABLE_SCHEMA = :database"),
+            database=self.migrate_engine.url.database).first()
+        self.assertGreater(row.total, 0, "No tables found. Wrong schema?")
 
-        noninnodb = self.migrate_engine.execute(
-            "SELECT count(*) "
-            "FROM information_schema.TABLES "
-            "WHERE TABLE_SCHEMA='%(database)s' "
-            "AND ENGINE != 'InnoDB' "
-            "AND TABLE_NAME != 'migrate_version'" %
-            {'database': self.migrate_engine.url.database})
-        count = noninnodb.scalar()
+        count = int(row.noninnodb or 0)
         self.assertEqual(count, 0, "%d non InnoDB tables created" % count)
 
 
@@ -1009,21 +938,16 @@ class ProjectTestCase(test.NoDBTestCase):
         # Walk both the nova_api and nova (cell) database migrations.
         includes_downgrade = []
         for subdir in ('api_migrations', ''):
-            py_glob = os.path.join(topdir, "db", "sqlalchemy", subdir,
-                                   "migrate_repo", "versions", "*.py")
-            for path in glob.iglob(py_glob):
-                has_upgrade = False
-                has_downgrade = False
-                with open(path, "r") as f:
-                    for line in f:
-                        if 'def upgrade(' in line:
-                            has_upgrade = True
-                        if 'def downgrade(' in line:
-                            has_downgrade = True
-
-                    if has_upgrade and has_downgrade:
-                        fname = os.path.basename(path)
-                        includes_downgrade.append(fname)
+            versions_dir = os.path.join(topdir, "db", "sqlalchemy", subdir,
+                                        "migrate_repo", "versions")
+            for fname in os.listdir(versions_dir):
+                if not fname.endswith('.py'):
+                    continue
+                with open(os.path.join(versions_dir, fname), "r") as f:
+                    source = f.read()
+
+                if 'def upgrade(' in source and 'def downgrade(' in source:
+                    includes_downgrade.append(fname)
 
         helpful_msg = ("The following migrations have a downgrade "
                        "which is not supported:"
@@ -830,6 +830,51 @@ class TestObjectSerializer(_BaseTestCase):
         ser = base.NovaObjectSerializer()
         self.assertEqual([1, 2], ser.serialize_entity(None, set([1, 2])))
 
+    def test_serialize_scalar_containers_are_copied(self):
+        ser = base.NovaObjectSerializer()
+        for thing in ([1, 'foo', None], {'foo': 1, 'bar': None}):
+            result = ser.serialize_entity(None, thing)
+            self.assertEqual(thing, result)
+            self.assertIsNot(thing, result)
+
+    def test_deserialize_scalar_containers_are_copied(self):
+        ser = base.NovaObjectSerializer()
+        for thing in ([1, 'foo', None], {'foo': 1, 'bar': None}):
+            result = ser.deserialize_entity(None, thing)
+            self.assertEqual(thing, result)
+            self.assertIsNot(thing, result)
+
+    def test_serialize_scalar_set_to_list(self):
+        ser = base.NovaObjectSerializer()
+        result = ser.serialize_entity(None, set(['foo', None]))
+        self.assertIsInstance(result, list)
+        self.assertEqual(set(['foo', None]), set(result))
+
+    def test_serialize_scalar_tuple(self):
+        ser = base.NovaObjectSerializer()
+        thing = (1, 'foo', None)
+        self.assertIs(thing, ser.serialize_entity(None, thing))
+        self.assertIs(thing, ser.deserialize_entity(None, thing))
+
+    def test_serialize_mixed_containers(self):
+        ser = base.NovaObjectSerializer()
+        obj = MyObj(foo=1)
+        for iterable in (list, tuple):
+            primitive = ser.serialize_entity(self.context, iterable([1, obj]))
+            self.assertEqual(iterable([1, obj.obj_to_primitive()]), primitive)
+            thing = ser.deserialize_entity(self.context, primitive)
+            self.assertIsInstance(thing, iterable)
+            self.assertEqual(1, thing[0])
+            self.assertIsInstance(thing[1], MyObj)
+        # dict case
+        primitive = ser.serialize_entity(self.context,
+                                         {'scalar': 1, 'obj': obj})
+        self.assertEqual({'scalar': 1, 'obj': obj.obj_to_primitive()},
+                         primitive)
+        thing = ser.deserialize_entity(self.context, primitive)
+        self.assertEqual(1, thing['scalar'])
+        self.assertIsInstance(thing['obj'], MyObj)
+
     def _test_deserialize_entity_newer(self, obj_version, backported_to,
                                        my_version='1.6'):
         ser = base.NovaObjectSerializer()
@@ -1337,6 +1382,13 @@ class TestObjEqualPrims(_BaseTestCase):
                         "Objects that only differ in an ignored field "
                         "should be equal")
 
+    def test_object_different_type_not_equal(self):
+        obj1 = MyObj(foo=1)
+        obj2 = MyOwnedObject(baz=1)
+        with mock.patch.object(obj1, 'obj_to_primitive') as mock_prim:
+            self.assertFalse(base.obj_equal_prims(obj1, obj2))
+        self.assertFalse(mock_prim.called)
+
 
 class TestObjMethodOverrides(test.NoDBTestCase):
     def test_obj_reset_changes(self):
@@ -42,6 +42,8 @@ from nova.tests.unit import matchers
 from nova.tests.unit.scheduler import fakes
 from nova.tests import uuidsentinel as uuids
 
+HYPERVISOR_VERSION = versionutils.convert_version_to_int('6.0.0')
+
 
 class FakeFilterClass1(filters.BaseHostFilter):
     def host_passes(self, host_state, filter_properties):
@@ -170,37 +172,37 @@ class HostManagerTestCase(test.NoDBTestCase):
         agg_get_all.return_value = [fake_agg]
         self.host_manager = host_manager.HostManager()
         self.assertEqual({1: fake_agg}, self.host_manager.aggs_by_id)
-        self.assertEqual({'fake-host': set([1])},
+        self.assertEqual({'fake-host': {1}},
                          self.host_manager.host_aggregates_map)
 
     def test_update_aggregates(self):
         fake_agg = objects.Aggregate(id=1, hosts=['fake-host'])
         self.host_manager.update_aggregates([fake_agg])
         self.assertEqual({1: fake_agg}, self.host_manager.aggs_by_id)
-        self.assertEqual({'fake-host': set([1])},
+        self.assertEqual({'fake-host': {1}},
                          self.host_manager.host_aggregates_map)
 
     def test_update_aggregates_remove_hosts(self):
         fake_agg = objects.Aggregate(id=1, hosts=['fake-host'])
         self.host_manager.update_aggregates([fake_agg])
         self.assertEqual({1: fake_agg}, self.host_manager.aggs_by_id)
-        self.assertEqual({'fake-host': set([1])},
+        self.assertEqual({'fake-host': {1}},
                          self.host_manager.host_aggregates_map)
         # Let's remove the host from the aggregate and update again
         fake_agg.hosts = []
         self.host_manager.update_aggregates([fake_agg])
         self.assertEqual({1: fake_agg}, self.host_manager.aggs_by_id)
-        self.assertEqual({'fake-host': set([])},
+        self.assertEqual({'fake-host': set()},
                          self.host_manager.host_aggregates_map)
 
     def test_delete_aggregate(self):
         fake_agg = objects.Aggregate(id=1, hosts=['fake-host'])
         self.host_manager.host_aggregates_map = collections.defaultdict(
-            set, {'fake-host': set([1])})
+            set, {'fake-host': {1}})
         self.host_manager.aggs_by_id = {1: fake_agg}
         self.host_manager.delete_aggregate(fake_agg)
         self.assertEqual({}, self.host_manager.aggs_by_id)
-        self.assertEqual({'fake-host': set([])},
+        self.assertEqual({'fake-host': set()},
                          self.host_manager.host_aggregates_map)
 
     def test_choose_host_filters_not_found(self):
@@ -228,11 +230,13 @@ class HostManagerTestCase(test.NoDBTestCase):
                       fake_filter_one)
 
     def _verify_result(self, info, result, filters=True):
+        expected_fprops = info['expected_fprops']
         for x in info['got_fprops']:
-            self.assertEqual(x, info['expected_fprops'])
+            self.assertIs(expected_fprops, x)
+        expected_objs = set(info['expected_objs'])
         if filters:
-            self.assertEqual(set(info['expected_objs']), set(info['got_objs']))
-        self.assertEqual(set(info['expected_objs']), set(result))
+            self.assertEqual(expected_objs, set(info['got_objs']))
+        self.assertEqual(expected_objs, set(result))
 
     def test_get_filtered_hosts(self):
         fake_properties = objects.RequestSpec(ignore_hosts=[],
@@ -513,39 +517,29 @@ class HostManagerTestCase(test.NoDBTestCase):
         self.assertEqual(calls, mock_log.warning.call_args_list)
 
         # Check that .service is set properly
-        for i in range(4):
-            compute_node = fakes.COMPUTE_NODES[i]
+        for compute_node in fakes.COMPUTE_NODES[:4]:
             host = compute_node.host
-            node = compute_node.hypervisor_hostname
-            state_key = (host, node)
+            state_key = (host, compute_node.hypervisor_hostname)
             self.assertEqual(host_states_map[state_key].service,
                     obj_base.obj_to_primitive(fakes.get_service_by_host(host)))
 
-        self.assertEqual(host_states_map[('host1', 'node1')].free_ram_mb,
-                         512)
-        # 511GB
-        self.assertEqual(host_states_map[('host1', 'node1')].free_disk_mb,
-                         524288)
-        self.assertEqual(host_states_map[('host2', 'node2')].free_ram_mb,
-                         1024)
-        # 1023GB
-        self.assertEqual(host_states_map[('host2', 'node2')].free_disk_mb,
-                         1048576)
-        self.assertEqual(host_states_map[('host3', 'node3')].free_ram_mb,
-                         3072)
-        # 3071GB
-        self.assertEqual(host_states_map[('host3', 'node3')].free_disk_mb,
-                         3145728)
+        # (state key, free_ram_mb, free_disk_mb)
+        expected_free = [
+            (('host1', 'node1'), 512, 524288),  # 511GB
+            (('host2', 'node2'), 1024, 1048576),  # 1023GB
+            (('host3', 'node3'), 3072, 3145728),  # 3071GB
+            (('host4', 'node4'), 8192, 8388608),  # 8191GB
+        ]
+        for state_key, free_ram_mb, free_disk_mb in expected_free:
+            host_state = host_states_map[state_key]
+            self.assertEqual(free_ram_mb, host_state.free_ram_mb)
+            self.assertEqual(free_disk_mb, host_state.free_disk_mb)
+
         self.assertThat(
                 objects.NUMATopology.obj_from_db_obj(
                         host_states_map[('host3', 'node3')].numa_topology
                     )._to_dict(),
                 matchers.DictMatches(fakes.NUMA_TOPOLOGY._to_dict()))
-        self.assertEqual(host_states_map[('host4', 'node4')].free_ram_mb,
-                         8192)
-        # 8191GB
-        self.assertEqual(host_states_map[('host4', 'node4')].free_disk_mb,
-                         8388608)
 
     @mock.patch.object(nova.objects.InstanceList, 'get_by_host')
     @mock.patch.object(host_manager.HostState, '_update_from_compute_node')
@@ -578,7 +572,7 @@ class HostManagerTestCase(test.NoDBTestCase):
         mock_get_by_host.return_value = objects.InstanceList()
         fake_agg = objects.Aggregate(id=1)
         self.host_manager.host_aggregates_map = collections.defaultdict(
-            set, {'fake': set([1])})
+            set, {'fake': {1}})
         self.host_manager.aggs_by_id = {1: fake_agg}
 
         self.host_manager.get_all_host_states('fake-context')
@@ -602,7 +596,7 @@ class HostManagerTestCase(test.NoDBTestCase):
         mock_get_by_host.return_value = objects.InstanceList()
         fake_agg = objects.Aggregate(id=1)
         self.host_manager.host_aggregates_map = collections.defaultdict(
-            set, {'other': set([1])})
+            set, {'other': {1}})
         self.host_manager.aggs_by_id = {1: fake_agg}
 
         self.host_manager.get_all_host_states('fake-context')
@@ -1076,7 +1070,6 @@ class HostStateTestCase(test.NoDBTestCase):
             'io_workload': '42',
         }
 
-        hyper_ver_int = versionutils.convert_version_to_int('6.0.0')
         compute = objects.ComputeNode(
             uuid=uuids.cn1,
             stats=stats, memory_mb=1, free_disk_gb=0, local_gb=0,
@@ -1086,7 +1079,7 @@ class HostStateTestCase(test.NoDBTestCase):
             host_ip='127.0.0.1', hypervisor_type='htype',
             hypervisor_hostname='hostname', cpu_info='cpu_info',
             supported_hv_specs=[],
-            hypervisor_version=hyper_ver_int, numa_topology=None,
+            hypervisor_version=HYPERVISOR_VERSION, numa_topology=None,
             pci_device_pools=None, metrics=None,
             cpu_allocation_ratio=16.0, ram_allocation_ratio=1.5,
             disk_allocation_ratio=1.0)
@@ -1104,7 +1097,7 @@ class HostStateTestCase(test.NoDBTestCase):
         self.assertEqual('hostname', host.hypervisor_hostname)
         self.assertEqual('cpu_info', host.cpu_info)
         self.assertEqual([], host.supported_instances)
-        self.assertEqual(hyper_ver_int, host.hypervisor_version)
+        self.assertEqual(HYPERVISOR_VERSION, host.hypervisor_version)
 
     def test_stat_consumption_from_compute_node_non_pci(self):
         stats = {
@@ -1120,7 +1113,6 @@ class HostStateTestCase(test.NoDBTestCase):
             'io_workload': '42',
         }
 
-        hyper_ver_int = versionutils.convert_version_to_int('6.0.0')
         compute = objects.ComputeNode(
             uuid=uuids.cn1,
             stats=stats, memory_mb=0, free_disk_gb=0, local_gb=0,
@@ -1130,7 +1122,7 @@ class HostStateTestCase(test.NoDBTestCase):
             host_ip='127.0.0.1', hypervisor_type='htype',
             hypervisor_hostname='hostname', cpu_info='cpu_info',
             supported_hv_specs=[],
-            hypervisor_version=hyper_ver_int, numa_topology=None,
+            hypervisor_version=HYPERVISOR_VERSION, numa_topology=None,
             pci_device_pools=None, metrics=None,
             cpu_allocation_ratio=16.0, ram_allocation_ratio=1.5,
             disk_allocation_ratio=1.0)
@@ -1138,7 +1130,7 @@ class HostStateTestCase(test.NoDBTestCase):
         host = host_manager.HostState("fakehost", "fakenode", uuids.cell)
         host.update(compute=compute)
         self.assertEqual([], host.pci_stats.pools)
-        self.assertEqual(hyper_ver_int, host.hypervisor_version)
+        self.assertEqual(HYPERVISOR_VERSION, host.hypervisor_version)
 
     def test_stat_consumption_from_compute_node_rescue_unshelving(self):
         stats = {
@@ -1154,7 +1146,6 @@ class HostStateTestCase(test.NoDBTestCase):
             'io_workload': '42',
         }
 
-        hyper_ver_int = versionutils.convert_version_to_int('6.0.0')
         compute = objects.ComputeNode(
             uuid=uuids.cn1,
             stats=stats, memory_mb=0, free_disk_gb=0, local_gb=0,
@@ -1164,7 +1155,7 @@ class HostStateTestCase(test.NoDBTestCase):
             host_ip='127.0.0.1', hypervisor_type='htype',
             hypervisor_hostname='hostname', cpu_info='cpu_info',
             supported_hv_specs=[],
-            hypervisor_version=hyper_ver_int, numa_topology=None,
+            hypervisor_version=HYPERVISOR_VERSION, numa_topology=None,
             pci_device_pools=None, metrics=None,
             cpu_allocation_ratio=16.0, ram_allocation_ratio=1.5,
             disk_allocation_ratio=1.0)
@@ -1177,7 +1168,7 @@ class HostStateTestCase(test.NoDBTestCase):
         self.assertEqual(10, len(host.stats))
 
         self.assertEqual([], host.pci_stats.pools)
-        self.assertEqual(hyper_ver_int, host.hypervisor_version)
+        self.assertEqual(HYPERVISOR_VERSION, host.hypervisor_version)
 
     @mock.patch('nova.utils.synchronized',
                 side_effect=lambda a: lambda f: lambda *args: f(*args))
@@ -1241,7 +1232,7 @@ class HostStateTestCase(test.NoDBTestCase):
 
         inst_topology = objects.InstanceNUMATopology(
                             cells = [objects.InstanceNUMACell(
-                                                      cpuset=set([0]),
+                                                      cpuset={0},
                                                       memory=512, id=0)])
 
         fake_requests = [{'request_id': uuids.request_id, 'count': 1,
@@ -1314,7 +1305,6 @@ class HostStateTestCase(test.NoDBTestCase):
                  source='source2',
                  timestamp=_ts_now),
         ]
-        hyper_ver_int = versionutils.convert_version_to_int('6.0.0')
         compute = objects.ComputeNode(
             uuid=uuids.cn1,
             metrics=jsonutils.dumps(metrics),
@@ -1325,7 +1315,7 @@ class HostStateTestCase(test.NoDBTestCase):
             host_ip='127.0.0.1', hypervisor_type='htype',
             hypervisor_hostname='hostname', cpu_info='cpu_info',
             supported_hv_specs=[],
-            hypervisor_version=hyper_ver_int,
+            hypervisor_version=HYPERVISOR_VERSION,
             numa_topology=fakes.NUMA_TOPOLOGY._to_json(),
             stats=None, pci_device_pools=None,
             cpu_allocation_ratio=16.0, ram_allocation_ratio=1.5,
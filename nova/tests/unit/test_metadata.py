@@ -1625,10 +1625,15 @@ class MetadataPasswordTestCase(test.TestCase):
 
     @mock.patch('nova.objects.InstanceMapping.get_by_instance_uuid')
     @mock.patch('nova.objects.Instance.get_by_uuid')
-    def _try_set_password(self, get_by_uuid, get_mapping, val=b'bar'):
+    def _try_set_password(self, get_by_uuid, get_mapping, val=b'bar',
+                          content_length=True):
         request = webob.Request.blank('')
         request.method = 'POST'
         request.body = val
+        if not content_length:
+            # Simulate a chunked request, which has no Content-Length.
+            del request.environ['CONTENT_LENGTH']
+            request.is_body_readable = True
         get_mapping.return_value = objects.InstanceMapping(cell_mapping=None)
         get_by_uuid.return_value = self.instance
 
@@ -1638,11 +1643,17 @@ class MetadataPasswordTestCase(test.TestCase):
 
         self.assertIn('password_0', self.instance.system_metadata)
         get_mapping.assert_called_once_with(mock.ANY, self.instance.uuid)
+        get_by_uuid.assert_called_once_with(
+            mock.ANY, self.instance.uuid, expected_attrs=['system_metadata'])
 
     def test_set_password(self):
         self.mdinst.password = ''
         self._try_set_password()
 
+    def test_set_password_without_content_length(self):
+        self.mdinst.password = ''
+        self._try_set_password(content_length=False)
+
     def test_conflict(self):
         self.mdinst.password = 'foo'
         self.assertRaises(webob.exc.HTTPConflict,
@@ -1653,3 +1664,21 @@ class MetadataPasswordTestCase(test.TestCase):
         self.assertRaises(webob.exc.HTTPBadRequest,
                           self._try_set_password,
                           val=(b'a' * (password.MAX_SIZE + 1)))
+
+    def test_too_large_content_length_does_not_read_body(self):
+        self.mdinst.password = ''
+        request = webob.Request.blank('')
+        request.method = 'POST'
+        request.environ['CONTENT_LENGTH'] = str(password.MAX_SIZE + 1)
+        with mock.patch.object(webob.Request, 'body',
+                               new_callable=mock.PropertyMock) as body:
+            self.assertRaises(webob.exc.HTTPBadRequest,
+                              password.handle_password, request, self.mdinst)
+            self.assertFalse(body.called)
+
+    def test_too_large_without_content_length(self):
+        self.mdinst.password = ''
+        self.assertRaises(webob.exc.HTTPBadRequest,
+                          self._try_set_password,
+                          val=(b'a' * (password.MAX_SIZE + 1)),
+                          content_length=False)
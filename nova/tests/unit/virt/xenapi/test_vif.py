@@ -38,32 +38,52 @@ fake_vif = {
     'uuid': 'fake-uuid-2',
 }
 
+fake_ovs_vif_rec = {
+    'uuid': fake_vif['uuid'],
+    'MAC': fake_vif['address'],
+    'network': 'fake_network',
+    'other_config': {
+        'nicira-iface-id': 'fake-nicira-iface-id',
+        'neutron-port-id': 'fake-neutron-port-id',
+    },
+}
+
+
+def _fake_vif_get_record(vif_ref):
+    if vif_ref == "fake_vif_ref":
+        return {'uuid': fake_vif['uuid'],
+                'MAC': fake_vif['address'],
+                'network': 'fake_network',
+                'other_config': {'nicira-iface-id': fake_vif['id']}
+                }
+    raise exception.Exception("Failed get vif record")
+
+
+def _fake_vif_destroy(vif_ref):
+    if vif_ref != "fake_vif_ref":
+        raise exception.Exception("unplug vif failed")
+
+
+def _fake_vif_create(vif_rec):
+    if vif_rec == "fake_vif_rec":
+        return "fake_vif_ref"
+    raise exception.Exception("VIF existed")
+
+
+_FAKE_XENAPI_CALLS = {
+    "VM.get_VIFs": lambda vm_ref: ["fake_vif_ref", "fake_vif_ref_A2"],
+    "VIF.get_record": _fake_vif_get_record,
+    "VIF.unplug": lambda vif_ref: None,
+    "VIF.destroy": _fake_vif_destroy,
+    "VIF.create": _fake_vif_create,
+}
+
 
 def fake_call_xenapi(method, *args):
-    if method == "VM.get_VIFs":
-        return ["fake_vif_ref", "fake_vif_ref_A2"]
-    if method == "VIF.get_record":
-        if args[0] == "fake_vif_ref":
-            return {'uuid': fake_vif['uuid'],
-                    'MAC': fake_vif['address'],
-                    'network': 'fake_network',
-                    'other_config': {'nicira-iface-id': fake_vif['id']}
-                    }
-        else:
-            raise exception.Exception("Failed get vif record")
-    if method == "VIF.unplug":
-        return
-    if method == "VIF.destroy":
-        if args[0] == "fake_vif_ref":
-            return
-        else:
-            raise exception.Exception("unplug vif failed")
-    if method == "VIF.create":
-        if args[0] == "fake_vif_rec":
-            return "fake_vif_ref"
-        else:
-            raise exception.Exception("VIF existed")
-    return "Unexpected call_xenapi: %s.%s" % (method, args)
+    handler = _FAKE_XENAPI_CALLS.get(method)
+    if handler is None:
+        return "Unexpected call_xenapi: %s.%s" % (method, args)
+    return handler(*args)
 
 
 class XenVIFDriverTestBase(stubs.XenAPITestBaseNoDB):
@@ -79,13 +99,13 @@ class XenVIFDriverTestBase(stubs.XenAPITestBaseNoDB):
         and we need to mock them at runtime.
         e.g. self._session.VIF.get_record which is dynamically
         created via the override function of __getattr__.
-        """
 
-        patcher = mock.patch.object(target, attribute,
-                                    return_value=return_val,
-                                    side_effect=side_effect)
-        mock_one = patcher.start()
-        self.addCleanup(patcher.stop)
+        The target must belong to self._session, which is a fresh mock for
+        every test, so the attribute is simply replaced with no cleanup.
+        """
+        mock_one = mock.MagicMock(return_value=return_val,
+                                  side_effect=side_effect)
+        setattr(target, attribute, mock_one)
         return mock_one
 
 
@@ -121,8 +141,8 @@ class XenVIFDriverTestCase(XenVIFDriverTestBase):
         ret_vif_ref = self.base_driver._create_vif(fake_vif, vif_rec, vm_ref)
         self.assertEqual("fake_vif_ref", ret_vif_ref)
 
-        expected = [mock.call('VIF.create', vif_rec)]
-        self.assertEqual(expected, self._session.call_xenapi.call_args_list)
+        self._session.call_xenapi.assert_called_once_with('VIF.create',
+                                                          vif_rec)
 
     def test_create_vif_exception(self):
         self.assertRaises(exception.NovaException,
@@ -136,8 +156,8 @@ class XenVIFDriverTestCase(XenVIFDriverTestBase):
         instance = {'name': "fake_instance"}
         vm_ref = "fake_vm_ref"
         self.base_driver.unplug(instance, fake_vif, vm_ref)
-        expected = [mock.call('VIF.destroy', 'fake_vif_ref')]
-        self.assertEqual(expected, self._session.call_xenapi.call_args_list)
+        self._session.call_xenapi.assert_called_once_with('VIF.destroy',
+                                                          'fake_vif_ref')
         mock_hot_unplug.assert_called_once_with(
             fake_vif, instance, 'fake_vm_ref', 'fake_vif_ref')
 
@@ -289,15 +309,8 @@ class XenAPIOpenVswitchDriverTestCase(XenVIFDriverTestBase):
                                 mock_brctl_add_if, mock_device_exists):
         vif_ref = "fake_vif_ref"
         instance = {'name': 'fake_instance_name'}
-        fake_vif_rec = {'uuid': fake_vif['uuid'],
-                        'MAC': fake_vif['address'],
-                        'network': 'fake_network',
-                        'other_config': {
-                            'nicira-iface-id': 'fake-nicira-iface-id',
-                            'neutron-port-id': 'fake-neutron-port-id'}
-                       }
         mock_VIF_get_record = self.mock_patch_object(
-            self._session.VIF, 'get_record', return_val=fake_vif_rec)
+            self._session.VIF, 'get_record', return_val=fake_ovs_vif_rec)
         mock_network_get_bridge = self.mock_patch_object(
             self._session.network, 'get_bridge',
             return_val='fake_bridge_name')
@@ -323,15 +336,8 @@ class XenAPIOpenVswitchDriverTestCase(XenVIFDriverTestBase):
                                 mock_brctl_add_if, mock_device_exists):
         vif_ref = "fake_vif_ref"
         instance = {'name': 'fake_instance_name'}
-        fake_vif_rec = {'uuid': fake_vif['uuid'],
-                        'MAC': fake_vif['address'],
-                        'network': 'fake_network',
-                        'other_config': {
-                            'nicira-iface-id': 'fake-nicira-iface-id',
-                            'neutron-port-id': 'fake-neutron-port-id'}
-                       }
         mock_VIF_get_record = self.mock_patch_object(
-            self._session.VIF, 'get_record', return_val=fake_vif_rec)
+            self._session.VIF, 'get_record', return_val=fake_ovs_vif_rec)
         mock_network_get_bridge = self.mock_patch_object(
             self._session.network, 'get_bridge',
             return_val='fake_bridge_name')